@@ -6,21 +6,21 @@
 
 import datetime
 import logging
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional
 
 import numpy as np
-import pandas as pd
 
 import pyoptinterface as poi
 
-from prepshot.utils import interpolate_z_by_q_or_s
-from prepshot.utils import cartesian_product
+from prepshot.utils import interpolate_z_batch
+from prepshot.utils import build_interpolators
+from prepshot.utils import cartesian_product_iter
 
 def initialize_waterhead(
     stations : List[str], year : List[int],
     month : List[int], hour : List[int],
     params : Dict[str, Any]
-) -> Tuple[pd.DataFrame, pd.DataFrame]:
+) -> Tuple[np.ndarray, np.ndarray]:
     """Initialize water head.
 
     Parameters
@@ -38,35 +38,36 @@ def initialize_waterhead(
 
     Returns
     -------
-    Tuple[pd.DataFrame, pd.DataFrame]
-        A tuple of two pandas.DataFrame objects, the first one is 
-        the old water head, the second one is the new water head.
+    Tuple[np.ndarray, np.ndarray]
+        A tuple of two numpy.ndarray objects with shape
+        (station, year, month, hour), the first one is the old water head,
+        the second one is the new water head.
     """
-    old_waterhead = pd.DataFrame(
-        index=stations,
-        columns=pd.MultiIndex.from_product(
-            [year, month, hour], names=['year', 'month', 'hour']
-        )
+    shape = (len(stations), len(year), len(month), len(hour))
+    head = np.array(
+        [params['reservoir_characteristics']['head', s] for s in stations],
+        dtype=np.float64
     )
-    new_waterhead = old_waterhead.copy(deep=True)
-
-    for s in stations:
-        old_waterhead.loc[s, :] = [
-            params['reservoir_characteristics']['head', s]
-        ] * (len(hour) * len(month) * len(year))
+    old_waterhead = np.empty(shape)
+    old_waterhead[:] = head[:, None, None, None]
+    new_waterhead = np.full(shape, np.nan)
     return old_waterhead, new_waterhead
 
 def compute_error(
-    old_waterhead : pd.DataFrame, new_waterhead : pd.DataFrame
+    old_waterhead : np.ndarray, new_waterhead : np.ndarray,
+    out : Optional[np.ndarray] = None
 ) -> float:
     """Calculate the error of the water head.
 
     Parameters
     ----------
-    old_waterhead : pandas.DataFrame
+    old_waterhead : numpy.ndarray
         The water head before the solution.
-    new_waterhead : pandas.DataFrame
+    new_waterhead : numpy.ndarray
         The water head after the solution.
+    out : Optional[numpy.ndarray], optional
+        Buffer with the shape of the water head to hold intermediate
+        results, by default None, i.e., a new buffer is allocated.
 
     Returns
     -------
@@ -74,51 +75,154 @@ def compute_error(
         The error of the water head.
     """
     new_waterhead[new_waterhead <= 0] = 1
-    error = (
-        abs(new_waterhead - old_waterhead)
-        / new_waterhead
-    ).mean(axis='columns').mean()
-    return error
+    out = np.subtract(new_waterhead, old_waterhead, out=out)
+    np.abs(out, out=out)
+    np.divide(out, new_waterhead, out=out)
+    return float(out.mean())
 
-def process_model_solution(
-    model : object, stations : List[str], year : List[int], month : List[int],
-    hour : List[int], params : Dict[str, Any],
-    old_waterhead : pd.DataFrame, new_waterhead : pd.DataFrame
-) -> bool:
-    """Process the solution of the model, updating the water head data.
+def get_solution_array(
+    model : object, variable : Any, stations : List[str], year : List[int],
+    month : List[int], hour : List[int]
+) -> np.ndarray:
+    """Read the solution of a variable indexed by station, hour, month and
+    year into an array.
+
+    Parameters
+    ----------
+    model : object
+        Model solved already.
+    variable : Any
+        Variables indexed by (station, hour, month, year).
+    stations : List[str]
+        List of hydropower stations.
+    year : List[int]
+        List of years.
+    month : List[int]
+        List of months.
+    hour : List[int]
+        List of hours.
+
+    Returns
+    -------
+    numpy.ndarray
+        Solution values with shape (station, year, month, hour).
+    """
+    shape = (len(stations), len(year), len(month), len(hour))
+    # Station codes are converted once per station instead of once per cell.
+    station_ids = [int(s) for s in stations]
+    keys = cartesian_product_iter(station_ids, year, month, hour)
+    get_value = model.get_value
+    return np.fromiter(
+        (get_value(variable[s, h, m, y]) for s, y, m, h in keys),
+        dtype=np.float64, count=int(np.prod(shape))
+    ).reshape(shape)
+
+def compute_waterhead(
+    stations : List[str], outflow : np.ndarray, storage : np.ndarray,
+    tail_interpolators : Dict[str, Any], fore_interpolators : Dict[str, Any]
+) -> np.ndarray:
+    """Calculate the water head of each station from the reservoir outflow
+    and storage.
+
+    Parameters
+    ----------
+    stations : List[str]
+        List of hydropower stations.
+    outflow : numpy.ndarray
+        Reservoir outflow with shape (station, year, month, hour).
+    storage : numpy.ndarray
+        Reservoir storage with shape (station, year, month, hour + 1), where
+        the hour axis includes the storage at the start of the first hour.
+    tail_interpolators : Dict[str, Any]
+        Tailrace level-discharge functions of each station.
+    fore_interpolators : Dict[str, Any]
+        Forebay level-volume functions of each station.
+
+    Returns
+    -------
+    numpy.ndarray
+        Water head with the same shape as `outflow`.
+    """
+    tail = interpolate_z_batch(stations, outflow, tail_interpolators)
+    fore = interpolate_z_batch(stations, storage, fore_interpolators)
+    # The forebay level of each hour is the mean of both ends of the hour.
+    # All following steps work in place on a single output array.
+    head = np.add(fore[..., :-1], fore[..., 1:])
+    head /= 2
+    head -= tail
+    return np.maximum(head, 0, out=head)
+
+def get_head_targets(
+    model : object, stations : List[str], year : List[int],
+    month : List[int], hour : List[int]
+) -> List[Tuple[Any, Any]]:
+    """Collect the output constraint and generation flow variable of each
+    station, year, month and hour, in the order of the water head array.
 
     Parameters
     ----------
     model : object
         Model to be solved.
-    stations : list
-        List  f hydropower stations.
-    year : list
+    stations : List[str]
+        List of hydropower stations.
+    year : List[int]
         List of years.
-    month : list
+    month : List[int]
         List of months.
-    hour : list
+    hour : List[int]
         List of hours.
+
+    Returns
+    -------
+    List[Tuple[Any, Any]]
+        Constraint and variable pairs whose coefficient is the water head.
+    """
+    return [
+        (model.output_calc_cons[s, h, m, y], model.genflow[s, h, m, y])
+        for s, y, m, h in cartesian_product_iter(stations, year, month, hour)
+    ]
+
+def process_model_solution(
+    model : object, params : Dict[str, Any],
+    old_waterhead : np.ndarray, new_waterhead : np.ndarray,
+    iteration_data : Dict[str, Any]
+) -> bool:
+    """Process the solution of the model, updating the water head data.
+
+    Parameters
+    ----------
+    model : object
+        Model to be solved.
     params : dict
         Dictionary of parameters for the model.
-    old_waterhead : pandas.DataFrame
+    old_waterhead : numpy.ndarray
         The water head before the solution.
-    new_waterhead : pandas.DataFrame
-        The water head after the solution.
+    new_waterhead : numpy.ndarray
+        The water head after the solution, updated in place.
+    iteration_data : Dict[str, Any]
+        Data shared by all iterations of a run, with the hydropower stations
+        (``stations``), years (``year``), months (``month``) and hours
+        (``hour``), the tailrace level-discharge and forebay level-volume
+        functions of each station (``tail_interpolators`` and
+        ``fore_interpolators``), and the constraint and variable pairs whose
+        coefficient depends on the water head (``head_targets``, see
+        :func:`get_head_targets`).
 
     Returns
     -------
     bool
         True if the model is solved, False otherwise.
     """
-    idx = pd.IndexSlice
-    for s, h, m, y in cartesian_product(stations, hour, month, year):
-        efficiency = params['reservoir_characteristics']['coeff', s]
-        model.set_normalized_coefficient(
-            model.output_calc_cons[s, h, m, y],
-            model.genflow[s, h, m, y],
-            - efficiency * 1e-3 * old_waterhead.loc[s, idx[y, m, h]]
-        )
+    stations = iteration_data['stations']
+    efficiency = np.array(
+        [params['reservoir_characteristics']['coeff', s] for s in stations]
+    )
+    coefficients = - efficiency[:, None, None, None] * 1e-3 * old_waterhead
+    set_normalized_coefficient = model.set_normalized_coefficient
+    for (constraint, variable), coefficient in zip(
+        iteration_data['head_targets'], coefficients.ravel().tolist()
+    ):
+        set_normalized_coefficient(constraint, variable, coefficient)
     # Solve the model and check the solution status.
     model.set_model_attribute(poi.ModelAttribute.Silent, False)
     model.optimize() # add log into log file
@@ -129,29 +233,19 @@ def process_model_solution(
         # If fixed head is True, do not update water head.
         new_waterhead = old_waterhead
         return True
-    # Iterate over each station to update water head data.
-    for stcd in stations:
-        outflow = np.array([[
-            [model.get_value(model.outflow[int(stcd), h, m, y]) for h in hour]
-            for m in month] for y in year]
-        )
-        storage = np.array([[
-            [model.get_value(model.storage_reservoir[int(stcd), h, m, y])
-            for h in model.hour_p] for m in month] for y in year]
-        )
-
-        tail = interpolate_z_by_q_or_s(
-            str(stcd), outflow,
-            params['reservoir_tailrace_level_discharge_function']
-        )
-        storage = interpolate_z_by_q_or_s(
-            str(stcd), storage, params['reservoir_forebay_level_volume_function']
-        )
+    # Collect the solution of all stations to update water head data.
+    year, month = iteration_data['year'], iteration_data['month']
+    outflow = get_solution_array(
+        model, model.outflow, stations, year, month, iteration_data['hour']
+    )
+    storage = get_solution_array(
+        model, model.storage_reservoir, stations, year, month, model.hour_p
+    )
 
-        # Calculate the new water head.
-        fore = (storage[:, :, :hour[-1]] + storage[:, :, 1:]) / 2
-        h = np.maximum(fore - tail, 0)
-        new_waterhead.loc[int(stcd), :] = h.ravel()
+    new_waterhead[:] = compute_waterhead(
+        stations, outflow, storage, iteration_data['tail_interpolators'],
+        iteration_data['fore_interpolators']
+    )
     return True
 
 def run_model_iteration(
@@ -187,16 +281,30 @@ def run_model_iteration(
     old_waterhead, new_waterhead = initialize_waterhead(
         stations, years, months, hours, params
     )
+    # Data built once and shared by all iterations.
+    iteration_data = {
+        'stations': stations, 'year': years, 'month': months, 'hour': hours,
+        'tail_interpolators': build_interpolators(
+            params['reservoir_tailrace_level_discharge_function']
+        ),
+        'fore_interpolators': build_interpolators(
+            params['reservoir_forebay_level_volume_function']
+        ),
+        'head_targets': get_head_targets(
+            model, stations, years, months, hours
+        )
+    }
 
     # Variables for iteration.
     error = 1
     errors = []
+    # Scratch array shared by the error and the water head update.
+    buffer = np.empty_like(old_waterhead)
     # Perform water head iteration.
     for iteration in range(1, max_iterations+1):
         alpha = 1 / iteration
         success = process_model_solution(
-            model, stations, years, months, hours, params,
-            old_waterhead, new_waterhead
+            model, params, old_waterhead, new_waterhead, iteration_data
         )
         if not success:
             return False
@@ -209,14 +317,18 @@ def run_model_iteration(
             )
             error = 0
         else:
-            error = compute_error(old_waterhead, new_waterhead)
+            error = compute_error(
+                old_waterhead, new_waterhead, buffer
+            )
         errors.append(error)
         logging.info('Water head error: %.2f%%', error)
         if error < error_threshold:
             return True
 
         # Update old water head for next iteration.
-        old_waterhead += alpha * (new_waterhead - old_waterhead)
+        np.subtract(new_waterhead, old_waterhead, out=buffer)
+        buffer *= alpha
+        old_waterhead += buffer
 
     logging.warning(
         "Ending iteration recorded at %s."
@@ -5,14 +5,24 @@
 and Excel files.
 """
 
+import os
 import json
 import sys
+import hmac
+import pickle
+import hashlib
 import logging
-from os import path
+import secrets
+from os import path, makedirs
+from typing import Optional
 
+import numpy as np
 import pandas as pd
 
-from prepshot.utils import calc_inv_cost_factor, calc_cost_factor
+from prepshot.utils import DiscountTable
+
+# Size in bytes of the secret key signing the cache of parsed sheets.
+CACHE_KEY_SIZE = 32
 
 
 def load_json(file_path : str) -> dict:
@@ -75,7 +85,8 @@ def extract_config_data(config_data : dict) -> dict:
 
 
 def load_excel_data(
-    input_folder : str, params_info : dict, data_store : dict
+    input_folder : str, params_info : dict, data_store : dict,
+    cache_folder : Optional[str] = None
 ) -> None:
     """Load data from Excel files based on the provided parameters.
 
@@ -88,6 +99,9 @@ def load_excel_data(
         information.
     data_store : dict
         Dictionary to store loaded data.
+    cache_folder : Optional[str], optional
+        Folder of the cache of parsed sheets, by default None, i.e., the
+        Excel files are always parsed.
     """
     try:
         for key, value in params_info.items():
@@ -98,7 +112,8 @@ def load_excel_data(
                 value["header_rows"],
                 value["unstack_levels"],
                 value["first_col_only"],
-                value["drop_na"]
+                value["drop_na"],
+                cache_folder
             )
     except FileNotFoundError as e:
         logging.error("Error loading %s data: %s", value["file_name"], e)
@@ -138,41 +153,46 @@ def compute_cost_factors(data_store : dict) -> None:
         Dictionary containing loaded parameters.
     """
     # Initialize dictionaries for computed cost factors.
-    data_store["trans_inv_factor"] = {}
     data_store["inv_factor"] = {}
-    data_store["fix_factor"] = {}
-    data_store["var_factor"] = {}
 
     # Initialize parameters for cost factor calculations.
     trans_line_lifetime = max(data_store["transmission_line_lifetime"].values())
     lifetime = data_store["lifetime"]
-    y_min, y_max = min(data_store["year"]), max(data_store["year"])
-
-    # Calculate cost factors
-    for tech in data_store["tech"]:
-        for year in data_store["year"]:
-            discount_rate = data_store["discount_factor"][year]
-            next_year = year+1 if year == y_max                               \
-                else data_store["year"][data_store["year"].index(year) + 1]
-            data_store["trans_inv_factor"][year] = calc_inv_cost_factor(
-                trans_line_lifetime, discount_rate, year, discount_rate,
-                y_min, y_max
-            )
-            data_store["inv_factor"][tech, year] = calc_inv_cost_factor(
-                lifetime[tech, year], discount_rate, year, discount_rate,
-                y_min, y_max
-            )
-            data_store["fix_factor"][year] = calc_cost_factor(
-                discount_rate, year, y_min, next_year
-            )
-            data_store["var_factor"][year] = calc_cost_factor(
-                discount_rate, year, y_min, next_year
-            )
+    years = data_store["year"]
+    y_max = max(years)
+    discount_rate = np.array(
+        [data_store["discount_factor"][year] for year in years]
+    )
+    next_years = np.append(years[1:], y_max + 1)
+
+    # Powers of discount rates are computed once and shared by all
+    # technologies and modeled years.
+    table = DiscountTable(
+        years, discount_rate, discount_rate,
+        max(trans_line_lifetime, *lifetime.values())
+    )
+
+    # Calculate cost factors for all modeled years at once.
+    trans_inv_factor = table.inv_cost_factor(trans_line_lifetime)
+    cost_factor = table.cost_factor(next_years).tolist()
+    data_store["trans_inv_factor"] = dict(
+        zip(years, trans_inv_factor.tolist())
+    )
+    data_store["fix_factor"] = dict(zip(years, cost_factor))
+    data_store["var_factor"] = dict(zip(years, cost_factor))
+    techs = data_store["tech"]
+    inv_factor = table.inv_cost_factor(
+        [[lifetime[tech, year] for year in years] for tech in techs]
+    ).tolist()
+    for tech, tech_inv_factor in zip(techs, inv_factor):
+        data_store["inv_factor"].update(
+            zip([(tech, year) for year in years], tech_inv_factor)
+        )
 
 
 def read_excel(
     filename, index_cols, header_rows, unstack_levels=None,
-    first_col_only=False, dropna=True
+    first_col_only=False, dropna=True, cache_folder=None
 ) -> pd.DataFrame:
     """Read data from an Excel file into a pandas DataFrame.
 
@@ -190,13 +210,28 @@ def read_excel(
         Whether to keep only the first column, by default False
     dropna : bool, optional
         Whether to drop rows with NaN values, by default True
+    cache_folder : str, optional
+        Folder of the cache of parsed sheets, see :func:`read_excel_cached`,
+        by default None, i.e., the Excel file is always parsed.
 
     Returns
     -------
     pandas.DataFrame
         A DataFrame containing the data from the Excel file.
     """
-    df = pd.read_excel(io=filename, index_col=index_cols, header=header_rows)
+    if cache_folder is None:
+        df = pd.read_excel(
+            io=filename, index_col=index_cols, header=header_rows
+        )
+    else:
+        df = read_excel_cached(filename, index_cols, header_rows, cache_folder)
+
+    if unstack_levels and dropna and not first_col_only                      \
+        and list(unstack_levels) == list(range(df.index.nlevels)):
+        # Unstacking all index levels in their order only to drop NaN
+        # values and convert to a dictionary is equivalent to collecting
+        # the non-NaN cells.
+        return unstacked_dict(df)
 
     if unstack_levels:
         df = df.unstack(level=unstack_levels)
@@ -205,13 +240,246 @@ def read_excel(
         df = df.iloc[:, 0]
 
     if dropna:
-        df = df.dropna().to_dict()
+        if isinstance(df, pd.Series):
+            df = non_na_dict(df)
+        else:
+            df = df.dropna().to_dict()
+
+    return df
+
+
+def non_na_dict(series : pd.Series) -> dict:
+    """Collect the non-NaN values of a Series into a dictionary, i.e., the
+    result of ``series.dropna().to_dict()`` without building the
+    intermediate Series.
+
+    Parameters
+    ----------
+    series : pandas.Series
+        Series to be converted.
+
+    Returns
+    -------
+    dict
+        Dictionary mapping index labels to values.
+    """
+    return {
+        label: value for label, value, is_valid in zip(
+            series.index, series.tolist(), series.notna().tolist()
+        ) if is_valid
+    }
+
+
+def unstacked_dict(df : pd.DataFrame) -> dict:
+    """Collect the non-NaN cells of a DataFrame into a dictionary keyed by
+    the column labels followed by the index labels, i.e., the result of
+    ``df.unstack(level=list(range(df.index.nlevels))).dropna().to_dict()``
+    without building the unstacked Series.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame to be converted.
+
+    Returns
+    -------
+    dict
+        Dictionary mapping tuples of column and index labels to values.
+    """
+    def as_tuple(label):
+        return label if isinstance(label, tuple) else (label,)
+
+    rows = [as_tuple(row) for row in df.index]
+    # Like the unstacked Series, all values share the common dtype of the
+    # columns, e.g., integers become floats next to a float column.
+    values = df.to_numpy().T.tolist()
+    is_valid = df.notna().to_numpy().T.tolist()
+    result = {}
+    for column, column_values, column_valid in zip(
+        df.columns, values, is_valid
+    ):
+        column = as_tuple(column)
+        for row, value, valid in zip(rows, column_values, column_valid):
+            if valid:
+                result[column + row] = value
+    return result
+
+
+def get_cache_folder() -> str:
+    """Get the per-user folder of the cache of parsed sheets, i.e.,
+    ``$XDG_CACHE_HOME/prepshot``, or ``~/.cache/prepshot`` if
+    ``XDG_CACHE_HOME`` is not set.
+
+    Returns
+    -------
+    str
+        Path to the cache folder.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or path.join(
+        path.expanduser('~'), '.cache'
+    )
+    return path.join(cache_home, 'prepshot')
+
+
+def read_excel_cached(
+    filename : str, index_cols : list, header_rows : list,
+    cache_folder : str
+) -> pd.DataFrame:
+    """Read an Excel file through a cache of parsed sheets kept in a
+    folder. A cached sheet is only reused if it was read from the same
+    path, with the same modification time and size of the Excel file, and
+    with the same index columns and header rows.
+
+    Cache files are pickles signed with a secret key generated in the cache
+    folder on first use. As unpickling can run arbitrary code, a file
+    whose signature does not match is never unpickled.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the input Excel file.
+    index_cols : list
+        List of column names to be used as index.
+    header_rows : list
+        List of rows to be used as header.
+    cache_folder : str
+        Folder of the cache files, see :func:`get_cache_folder`.
 
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame containing the data from the Excel file.
+    """
+    filename = path.abspath(filename)
+    excel_stat = os.stat(filename)
+    cache_key = (
+        filename, excel_stat.st_mtime_ns, excel_stat.st_size,
+        index_cols, header_rows
+    )
+    cache_file = path.join(
+        cache_folder,
+        f"{hashlib.sha256(filename.encode('utf-8')).hexdigest()}.pkl"
+    )
+    try:
+        secret = load_cache_secret(cache_folder)
+    except OSError as e:
+        logging.warning("Input cache disabled: %s", e)
+        secret = None
+
+    if secret is not None:
+        df = read_cache_file(cache_file, secret, cache_key)
+        if df is not None:
+            return df
+
+    df = pd.read_excel(io=filename, index_col=index_cols, header=header_rows)
+    if secret is not None:
+        payload = pickle.dumps((cache_key, df))
+        try:
+            with open(cache_file, 'wb') as f:
+                f.write(sign_cache(secret, payload) + payload)
+        except OSError as e:
+            logging.warning("Failed to cache %s: %s", filename, e)
     return df
 
 
+def load_cache_secret(cache_folder : str) -> bytes:
+    """Load the secret key signing the cache files of a folder, generating
+    it on first use in a file only readable by the current user.
+
+    Parameters
+    ----------
+    cache_folder : str
+        Folder of the cache files.
+
+    Returns
+    -------
+    bytes
+        The secret key.
+
+    Raises
+    ------
+    OSError
+        If the key can neither be read nor generated.
+    """
+    makedirs(cache_folder, mode=0o700, exist_ok=True)
+    key_file = path.join(cache_folder, 'cache.key')
+    try:
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(key_file, 'rb') as f:
+            secret = f.read()
+        if len(secret) != CACHE_KEY_SIZE:
+            raise OSError(f"Invalid cache key {key_file}") from None
+        return secret
+    secret = secrets.token_bytes(CACHE_KEY_SIZE)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(secret)
+    return secret
+
+
+def sign_cache(secret : bytes, payload : bytes) -> bytes:
+    """Compute the signature of the content of a cache file.
+
+    Parameters
+    ----------
+    secret : bytes
+        The secret key of the cache folder.
+    payload : bytes
+        The pickled content.
+
+    Returns
+    -------
+    bytes
+        HMAC-SHA256 signature of the content.
+    """
+    return hmac.new(secret, payload, hashlib.sha256).digest()
+
+
+def read_cache_file(
+    cache_file : str, secret : bytes, cache_key : tuple
+) -> Optional[pd.DataFrame]:
+    """Read a parsed sheet from a cache file. Files without a valid
+    signature are not unpickled.
+
+    Parameters
+    ----------
+    cache_file : str
+        Path to the cache file.
+    secret : bytes
+        The secret key of the cache folder.
+    cache_key : tuple
+        Source file and read options the sheet must have been cached for.
+
+    Returns
+    -------
+    Optional[pandas.DataFrame]
+        The cached sheet, or None if there is no valid cache for
+        `cache_key`.
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            signature = f.read(hashlib.sha256().digest_size)
+            payload = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logging.warning("Ignoring cache %s: %s", cache_file, e)
+        return None
+    if not hmac.compare_digest(signature, sign_cache(secret, payload)):
+        logging.warning("Ignoring cache %s: invalid signature", cache_file)
+        return None
+    try:
+        cached_key, df = pickle.loads(payload)
+    except Exception as e: # pylint: disable=broad-except
+        # Caches written with another pandas version may fail to load.
+        logging.warning("Ignoring cache %s: %s", cache_file, e)
+        return None
+    return df if cached_key == cache_key else None
+
+
 def process_data(
-    params_info : dict, input_folder : str
+    params_info : dict, input_folder : str,
+    cache_folder : Optional[str] = None
 ) -> dict:
     """Load and process data from input folder based on parameters settings.
 
@@ -221,6 +489,9 @@ def process_data(
         Dictionary containing parameters information.
     input_folder : str
         Path to the input folder.
+    cache_folder : Optional[str], optional
+        Folder of the cache of parsed sheets, by default None, i.e., the
+        Excel files are always parsed.
 
     Returns
     -------
@@ -228,7 +499,7 @@ def process_data(
         Dictionary containing processed parameters.
     """
     data_store = {}
-    load_excel_data(input_folder, params_info, data_store)
+    load_excel_data(input_folder, params_info, data_store, cache_folder)
     extract_sets(data_store)
     compute_cost_factors(data_store)
 
@@ -5,7 +5,7 @@
 the pyoptinterface library.
 """
 
-from prepshot.utils import cartesian_product
+from prepshot.utils import cartesian_product_iter
 from prepshot._model.demand import AddDemandConstraints
 from prepshot._model.generation import AddGenerationConstraints
 from prepshot._model.cost import AddCostObjective
@@ -88,8 +88,10 @@ def define_complex_sets(model : object) -> None:
     model : object
         Model to be solved.
     """
-    trans_sets = model.params['transmission_line_existing_capacity'].keys()
-    for z_i, z1_i in cartesian_product(model.zone, model.zone):
+    trans_sets = frozenset(
+        model.params['transmission_line_existing_capacity'].keys()
+    )
+    for z_i, z1_i in cartesian_product_iter(model.zone, model.zone):
         if (z_i, z1_i) not in trans_sets:
             model.params['transmission_line_existing_capacity'][z_i, z1_i] = 0
             model.params['transmission_line_efficiency'][z_i, z1_i] = 0
@@ -12,7 +12,7 @@ import xarray as xr
 import pandas as pd
 
 from prepshot.logs import timer
-from prepshot.utils import cartesian_product
+from prepshot.utils import cartesian_product_iter
 
 
 def create_data_array(
@@ -38,13 +38,16 @@ def create_data_array(
         A DataArray with the specified data, dimensions, coordinates and units.
     """
     coords = {dim:getattr(model, dim) for dim in dims}
-    index_tuple = cartesian_product(*coords.values())
+    shape = [len(coord) for coord in coords.values()]
     if len(dims) == 1:
-        index_tuple = [i[0] for i in index_tuple]
-    data_values = data.map(model.get_value)
-    data = np.array(
-        [data_values[tuple_] for tuple_ in index_tuple]
-    ).reshape([len(coord) for coord in coords.values()])
+        index_tuple = coords[dims[0]]
+    else:
+        index_tuple = cartesian_product_iter(*coords.values())
+    get_value = model.get_value
+    data = np.fromiter(
+        (get_value(data[tuple_]) for tuple_ in index_tuple),
+        dtype=np.float64, count=int(np.prod(shape))
+    ).reshape(shape)
     return xr.DataArray(data=data,
                         dims=dims,
                         coords=coords,
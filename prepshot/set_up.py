@@ -11,6 +11,7 @@ from os import path, makedirs
 from typing import Dict, List, Any
 
 from prepshot.load_data import load_json, extract_config_data, process_data
+from prepshot.load_data import get_cache_folder
 from prepshot.logs import setup_logging, log_parameter_info
 
 
@@ -75,8 +76,13 @@ def initialize_environment(config_files : Dict[str, str]) -> Dict[str, Any]:
             params[param]["file_name"] = params[param]["file_name"] \
                 + f"_{getattr(args, param)}"
 
+    # Parsed input sheets are only cached across runs if enabled.
+    cache_folder = None
+    if config_data['general_parameters'].get('cache_inputs', False):
+        cache_folder = get_cache_folder()
+
     # Load and process params data
-    params = process_data(params, input_filepath)
+    params = process_data(params, input_filepath, cache_folder)
     params['command_line_args'] = args
 
     # Combine the configuration data with processed parameter data.
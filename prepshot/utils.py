@@ -124,10 +124,9 @@ And we can calculate the investment factor as follows:
     factor_{y}^{inv} = \\frac{i}{1-(1+i)^{-n}}\\times
     \\frac{1-(1+r)^{-min(n,k)}}{r(1+r)^m}
 """
-from typing import Union, Tuple, List
+from typing import Union, Tuple, List, Dict, Callable, Iterator
 from itertools import product
 
-from scipy import interpolate
 import pandas as pd
 import numpy as np
 
@@ -144,9 +143,8 @@ def check_positive(*values : Union[int, float]) -> None:
     ValueError
         If any value is less than or equal to 0.
     """
-    for value in values:
-        if value <= 0:
-            raise ValueError("All arguments must be greater than 0.")
+    if values and min(values) <= 0:
+        raise ValueError("All arguments must be greater than 0.")
 
 def calc_inv_cost_factor(
     dep_period : int,
@@ -207,11 +205,55 @@ def calc_inv_cost_factor(
         or (year_built < year_min):
         raise ValueError("Invalid year values.")
 
+    return _calc_inv_cost_factor_unchecked(
+        dep_period, interest_rate, year_built, discount_rate, year_min,
+        year_max
+    )
+
+def calc_capital_recovery_factor(
+    interest_rate : float,
+    dep_period : int
+) -> float:
+    """Compute the capital recovery factor, i.e., the share of the
+    investment paid each year over the depreciation period.
+
+    Parameters
+    ----------
+    interest_rate : float
+        Interest rate.
+    dep_period : int
+        Depreciation period, in years.
+
+    Returns
+    -------
+    float
+        Capital recovery factor.
+
+    Examples
+    --------
+    >>> calc_capital_recovery_factor(0.05, 20)
+    0.080243
+
+    """
+    return interest_rate / (1 - (1 + interest_rate) ** (-dep_period))
+
+def _calc_inv_cost_factor_unchecked(
+    dep_period : int,
+    interest_rate : float,
+    year_built : int,
+    discount_rate : float,
+    year_min : int,
+    year_max : int
+) -> float:
+    """Compute the investment cost factor without validating the arguments,
+    see :func:`calc_inv_cost_factor`.
+    """
     years_since_min = year_built - year_min
     years_to_max = year_max - year_built + 1
-    return (interest_rate / (1 - (1 + interest_rate) ** (-dep_period))
-             * (1 - (1 + discount_rate) ** (-min(dep_period, years_to_max)))
-             / (discount_rate * (1 + discount_rate) ** years_since_min))
+    one_plus_r = 1 + discount_rate
+    return (calc_capital_recovery_factor(interest_rate, dep_period)
+             * (1 - one_plus_r ** (-min(dep_period, years_to_max)))
+             / (discount_rate * one_plus_r ** years_since_min))
 
 def calc_cost_factor(
     discount_rate : float,
@@ -262,15 +304,274 @@ def calc_cost_factor(
             + "equal to the current modeled year."
         )
 
+    return _calc_cost_factor_unchecked(
+        discount_rate, modeled_year, year_min, next_modeled_year
+    )
+
+def _calc_cost_factor_unchecked(
+    discount_rate : float,
+    modeled_year : int,
+    year_min : int,
+    next_modeled_year : int
+) -> float:
+    """Compute the variable and fixed cost factor without validating the
+    arguments, see :func:`calc_cost_factor`.
+    """
     years_since_min = modeled_year - year_min
     years_to_next = next_modeled_year - modeled_year
-    return (1 - (1 + discount_rate) ** (-years_to_next))                      \
-        / (discount_rate * (1 + discount_rate) ** (years_since_min - 1))
+    one_plus_r = 1 + discount_rate
+    if years_to_next == 1:
+        # A single year reduces to its discount factor, which also avoids
+        # the cancellation in 1 - (1 + r) ** -1 for small rates.
+        return 1 / one_plus_r ** years_since_min
+    return (1 - one_plus_r ** (-years_to_next))                               \
+        / (discount_rate * one_plus_r ** (years_since_min - 1))
+
+class DiscountTable:
+    """Powers of the discount and interest rates of each modeled year,
+    precomputed once so that cost factors of all technologies can be looked
+    up instead of recomputed.
+
+    Row ``j`` of the tables belongs to the ``j``-th modeled year, i.e.,
+    ``disc_pow[j, k]`` is :math:`(1+r_j)^k` and ``int_pow[j, n]`` is
+    :math:`(1+i_j)^n`.
+    """
+    def __init__(
+        self,
+        years : List[int],
+        discount_rate : Union[float, np.ndarray],
+        interest_rate : Union[float, np.ndarray],
+        max_dep_period : Union[int, float]
+    ) -> None:
+        """Initialize the class and fill the tables.
+
+        Parameters
+        ----------
+        years : List[int]
+            Modeled years of the planning horizon, in ascending order.
+        discount_rate : Union[float, numpy.ndarray]
+            Discount rate of each modeled year.
+        interest_rate : Union[float, numpy.ndarray]
+            Interest rate of each modeled year.
+        max_dep_period : Union[int, float]
+            The longest depreciation period to be looked up. Powers for
+            fractional periods are computed directly instead.
+
+        Raises
+        ------
+        ValueError
+            If any argument is less than or equal to 0.
+        """
+        self.years = np.asarray(years)
+        self.discount_rate = np.broadcast_to(
+            np.asarray(discount_rate, dtype=np.float64), self.years.shape
+        )
+        self.interest_rate = np.broadcast_to(
+            np.asarray(interest_rate, dtype=np.float64), self.years.shape
+        )
+        for values in (self.years, self.discount_rate, self.interest_rate):
+            if np.any(values <= 0):
+                raise ValueError("All arguments must be greater than 0.")
+        check_positive(max_dep_period)
+        self.year_min = int(self.years.min())
+        self.year_max = int(self.years.max())
+        self.max_dep_period = int(max_dep_period)
+        self.rows = np.arange(len(self.years))
+        horizon = self.year_max - self.year_min + 1
+        self.disc_pow = np.power.outer(
+            1 + self.discount_rate, np.arange(horizon + 1)
+        )
+        self.int_pow = np.power.outer(
+            1 + self.interest_rate, np.arange(self.max_dep_period + 1)
+        )
+
+    def inv_cost_factor(
+        self, dep_period : Union[int, float, np.ndarray]
+    ) -> np.ndarray:
+        """Look up the investment cost factor of each modeled year, see
+        :func:`calc_inv_cost_factor`.
+
+        Parameters
+        ----------
+        dep_period : Union[int, float, numpy.ndarray]
+            Depreciation period(s), in years, of the infrastructure built
+            in each modeled year. A two-dimensional array holds one row per
+            technology and one column per modeled year.
+
+        Returns
+        -------
+        numpy.ndarray
+            Investment cost factor of each modeled year, with the shape of
+            `dep_period` broadcast against the modeled years.
+
+        Raises
+        ------
+        ValueError
+            If a depreciation period is less than or equal to 0.
+        """
+        n = np.asarray(dep_period, dtype=np.float64)
+        n = np.broadcast_to(
+            n, np.broadcast_shapes(n.shape, self.years.shape)
+        )
+        if np.any(n <= 0):
+            raise ValueError("All arguments must be greater than 0.")
+        m = self.years - self.year_min
+        k = np.minimum(n, self.year_max - self.years + 1)
+        rows = self.rows
+        return (self.interest_rate
+                / (1 - 1 / self._power(self.int_pow, self.interest_rate, n))
+                * (1 - 1 / self._power(self.disc_pow, self.discount_rate, k))
+                / (self.discount_rate * self.disc_pow[rows, m]))
+
+    def _power(
+        self,
+        table : np.ndarray,
+        rate : np.ndarray,
+        exponent : np.ndarray
+    ) -> np.ndarray:
+        """Look up powers of one plus the rate of each modeled year in a
+        table, computing them directly for exponents that are fractional or
+        beyond the end of the table.
+
+        Parameters
+        ----------
+        table : numpy.ndarray
+            Table of powers, either `disc_pow` or `int_pow`.
+        rate : numpy.ndarray
+            Rate of each modeled year the table was built from.
+        exponent : numpy.ndarray
+            Exponents, broadcast against the modeled years.
+
+        Returns
+        -------
+        numpy.ndarray
+            Powers with the shape of `exponent`.
+        """
+        in_table = (exponent % 1 == 0) & (exponent < table.shape[1])
+        if np.all(in_table):
+            return table[self.rows, exponent.astype(np.int64)]
+        return np.where(
+            in_table,
+            table[self.rows, np.where(in_table, exponent, 0).astype(np.int64)],
+            (1 + rate) ** exponent
+        )
+
+    def cost_factor(
+        self, next_modeled_years : Union[List[int], np.ndarray]
+    ) -> np.ndarray:
+        """Look up the variable and fixed cost factor of each modeled year,
+        see :func:`calc_cost_factor`.
+
+        Parameters
+        ----------
+        next_modeled_years : Union[List[int], numpy.ndarray]
+            The subsequent modeled year of each modeled year.
+
+        Returns
+        -------
+        numpy.ndarray
+            Cost factor of each modeled year.
+
+        Raises
+        ------
+        ValueError
+            If a next modeled year is not greater than its modeled year or
+            is outside the range of the table.
+        """
+        years_to_next = np.asarray(next_modeled_years) - self.years
+        if np.any(years_to_next <= 0)                                         \
+            or np.any(years_to_next >= self.disc_pow.shape[1]):
+            raise ValueError("Invalid next modeled year values.")
+        m = self.years - self.year_min
+        rows = self.rows
+        return ((1 + self.discount_rate)
+                * (1 - 1 / self.disc_pow[rows, years_to_next])
+                / (self.discount_rate * self.disc_pow[rows, m]))
+
+def build_zqv_registry(
+    zqv : pd.DataFrame
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Extract the ZQ or ZV points of each hydropower station as contiguous
+    float64 arrays sorted by discharge or volume.
+
+    Parameters
+    ----------
+    zqv : pandas.DataFrame
+        DataFrame of ZQ or ZV values.
+
+    Returns
+    -------
+    Dict[str, Tuple[numpy.ndarray, numpy.ndarray]]
+        Sorted discharge or volume values and the corresponding water
+        levels, keyed by the code of the station as string.
+    """
+    x_col = 'Q' if 'Q' in zqv.columns else 'V'
+    registry = {}
+    for name, zqv_station in zqv.groupby(zqv.name.astype(str)):
+        x = zqv_station[x_col].to_numpy(dtype=np.float64)
+        z = zqv_station.Z.to_numpy(dtype=np.float64)
+        order = np.argsort(x, kind='stable')
+        registry[name] = (
+            np.ascontiguousarray(x[order]), np.ascontiguousarray(z[order])
+        )
+    return registry
+
+def _linear_interpolator(
+    x : np.ndarray,
+    z : np.ndarray
+) -> Callable[[Union[np.ndarray, float]], np.ndarray]:
+    """Create a piecewise linear interpolation function which extrapolates
+    linearly beyond both ends of the given points.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        X-coordinates of the points in ascending order.
+    z : numpy.ndarray
+        Y-coordinates of the points.
+
+    Returns
+    -------
+    Callable[[Union[numpy.ndarray, float]], numpy.ndarray]
+        Interpolation function.
+    """
+    last = len(x) - 2
+
+    def interpolator(qs : Union[np.ndarray, float]) -> np.ndarray:
+        qs = np.asarray(qs, dtype=np.float64)
+        # Clipping the segment index extends the first and last segments
+        # beyond both ends, which extrapolates without branching.
+        idx = np.clip(np.searchsorted(x, qs, side='right') - 1, 0, last)
+        x0, z0 = x[idx], z[idx]
+        slope = (z[idx + 1] - z0) / (x[idx + 1] - x0)
+        return z0 + slope * (qs - x0)
+    return interpolator
+
+def build_interpolators(
+    zqv : pd.DataFrame
+) -> Dict[str, Callable[[Union[np.ndarray, float]], np.ndarray]]:
+    """Build the interpolation function of each hydropower station from a
+    table of ZQ or ZV values.
+
+    Parameters
+    ----------
+    zqv : pandas.DataFrame
+        DataFrame of ZQ or ZV values.
+
+    Returns
+    -------
+    Dict[str, Callable[[Union[numpy.ndarray, float]], numpy.ndarray]]
+        Interpolation functions keyed by the code of the station as string.
+    """
+    return {
+        name: _linear_interpolator(x, z)
+        for name, (x, z) in build_zqv_registry(zqv).items()
+    }
 
 def interpolate_z_by_q_or_s(
     name : str,
     qs : Union[np.ndarray, float],
-    zqv : pd.DataFrame
+    zqv : Union[pd.DataFrame, Dict[str, Callable]]
 ) -> float:
     """Interpolate forebay water level (Z) by reservoir storage (S) or tailrace
     water level (Z) by the reservoir outflow (Q).
@@ -281,18 +582,50 @@ def interpolate_z_by_q_or_s(
         Code of the hydropower station.
     qs : Union[np.ndarray, float]
         Reservoir storage or outflow values. 
-    zqv : pandas.DataFrame
-        DataFrame of ZQ or ZV values.
+    zqv : Union[pandas.DataFrame, Dict[str, Callable]]
+        DataFrame of ZQ or ZV values, or interpolation functions built
+        by :func:`build_interpolators`. The latter avoids filtering the
+        DataFrame on each call.
 
     Returns
     -------
     Union[np.ndarray, float]
         Interpolated values.
     """
-    zqv_station = zqv[(zqv.name == int(name)) | (zqv.name == str(name))]
-    x = zqv_station.Q if 'Q' in zqv_station.columns else zqv_station.V
-    f_zqv = interpolate.interp1d(x, zqv_station.Z, fill_value='extrapolate')
-    return f_zqv(qs)
+    if isinstance(zqv, pd.DataFrame):
+        zqv = build_interpolators(zqv)
+    return zqv[str(name)](qs)
+
+def interpolate_z_batch(
+    names : List[str],
+    qs_array : Union[np.ndarray, List],
+    zqv : Union[pd.DataFrame, Dict[str, Callable]]
+) -> np.ndarray:
+    """Interpolate water levels of several hydropower stations at once.
+
+    Parameters
+    ----------
+    names : List[str]
+        Codes of the hydropower stations.
+    qs_array : Union[numpy.ndarray, List]
+        Reservoir storage or outflow values, with one row along the first
+        axis for each station in `names`.
+    zqv : Union[pandas.DataFrame, Dict[str, Callable]]
+        DataFrame of ZQ or ZV values, or interpolation functions built
+        by :func:`build_interpolators`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Interpolated values with the same shape as `qs_array`.
+    """
+    if isinstance(zqv, pd.DataFrame):
+        zqv = build_interpolators(zqv)
+    qs_array = np.asarray(qs_array, dtype=np.float64)
+    out = np.empty_like(qs_array)
+    for i, name in enumerate(names):
+        out[i] = zqv[str(name)](qs_array[i])
+    return out
 
 def cartesian_product(
     *args : List[Union[int, str]]
@@ -318,3 +651,28 @@ def cartesian_product(
 
     """
     return list(product(*args))
+
+def cartesian_product_iter(
+    *args : List[Union[int, str]]
+) -> Iterator[Tuple[Union[int, str]]]:
+    """Generate cartesian product of input iterables lazily. Unlike
+    :func:`cartesian_product`, the tuples are not materialized in a list,
+    which suits callers that only iterate over the product once.
+
+    Parameters
+    ----------
+    args : List[Union[int, str]]
+        Iterables to be combined.
+
+    Returns
+    -------
+    Iterator[Tuple[Union[int, str]]]
+        Iterator over the tuples of the Cartesian product.
+
+    Examples
+    --------
+    >>> list(cartesian_product_iter([1, 2], [7, 8]))
+    [(1, 7), (1, 8), (2, 7), (2, 8)]
+
+    """
+    return product(*args)
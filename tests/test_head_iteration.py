@@ -0,0 +1,163 @@
+"""This module contains tests for the head_iteration module.
+"""
+
+import unittest
+from itertools import product
+
+import numpy as np
+import pyoptinterface as poi
+
+from prepshot._model.head_iteration import compute_error
+from prepshot._model.head_iteration import get_solution_array
+from prepshot._model.head_iteration import get_head_targets
+from prepshot._model.head_iteration import process_model_solution
+
+def encode(s, h, m, y):
+    """Encode the index of a variable as a distinct value.
+    """
+    return 1000 * s + 100 * h + 10 * m + (y - 2020)
+
+class StubModel:
+    """Solved model whose variables are indexed by (station, hour, month,
+    year) and whose solution value is :func:`encode` of that index.
+    """
+    def __init__(self, stations, year, month, hour):
+        self.hour_p = [0] + hour
+        keys = list(product(stations, self.hour_p, month, year))
+        self.outflow = {k: ('outflow',) + k for k in keys}
+        self.storage_reservoir = {k: ('storage',) + k for k in keys}
+        self.genflow = {k: ('genflow',) + k for k in keys}
+        self.output_calc_cons = {k: ('cons',) + k for k in keys}
+        self.coefficients = {}
+
+    def get_value(self, variable):
+        """Return the encoded index of a variable.
+        """
+        return float(encode(*variable[1:]))
+
+    def set_normalized_coefficient(self, constraint, variable, value):
+        """Record the coefficient of a variable in a constraint.
+        """
+        self.coefficients[constraint, variable] = value
+
+    def set_model_attribute(self, _attribute, _value):
+        """Ignore model attributes.
+        """
+
+    def optimize(self):
+        """Do nothing, as the solution is known.
+        """
+
+    def get_model_attribute(self, _attribute):
+        """Report an optimal solution.
+        """
+        return poi.TerminationStatusCode.OPTIMAL
+
+class TestHeadIteration(unittest.TestCase):
+    """Tests for the head_iteration module.
+    """
+
+    def setUp(self):
+        self.stations = [1, 2]
+        self.year = [2020, 2025]
+        self.month = [1, 2, 3]
+        self.hour = [1, 2]
+        self.model = StubModel(
+            self.stations, self.year, self.month, self.hour
+        )
+
+    def test_get_solution_array(self):
+        """Test the get_solution_array function.
+        """
+        outflow = get_solution_array(
+            self.model, self.model.outflow, self.stations, self.year,
+            self.month, self.hour
+        )
+        self.assertEqual(outflow.shape, (2, 2, 3, 2))
+        for (i, s), (j, y), (k, m), (l, h) in product(
+            enumerate(self.stations), enumerate(self.year),
+            enumerate(self.month), enumerate(self.hour)
+        ):
+            self.assertEqual(outflow[i, j, k, l], encode(s, h, m, y))
+
+    def test_get_head_targets(self):
+        """Test the get_head_targets function.
+        """
+        targets = get_head_targets(
+            self.model, self.stations, self.year, self.month, self.hour
+        )
+        self.assertEqual(len(targets), 24)
+        self.assertEqual(
+            targets[1], (('cons', 1, 2, 1, 2020), ('genflow', 1, 2, 1, 2020))
+        )
+        self.assertEqual(
+            targets[-1], (('cons', 2, 2, 3, 2025), ('genflow', 2, 2, 3, 2025))
+        )
+
+    def test_process_model_solution(self):
+        """Test the process_model_solution function with linear ZQ and ZV
+        curves, i.e., the forebay level equals the storage and the tailrace
+        level is the outflow scaled by a factor of each station.
+        """
+        shape = (2, 2, 3, 2)
+        old_waterhead = np.arange(1, 25, dtype=np.float64).reshape(shape)
+        new_waterhead = np.full(shape, np.nan)
+        params = {
+            'reservoir_characteristics': {('coeff', 1): 8, ('coeff', 2): 9},
+            'iteration_number': 5
+        }
+        scale = {1: 0.01, 2: 0.02}
+        tail_interpolators = {
+            str(s): lambda x, s=s: scale[s] * x for s in self.stations
+        }
+        fore_interpolators = {str(s): lambda x: x for s in self.stations}
+        iteration_data = {
+            'stations': self.stations, 'year': self.year,
+            'month': self.month, 'hour': self.hour,
+            'tail_interpolators': tail_interpolators,
+            'fore_interpolators': fore_interpolators,
+            'head_targets': get_head_targets(
+                self.model, self.stations, self.year, self.month, self.hour
+            )
+        }
+        self.assertTrue(process_model_solution(
+            self.model, params, old_waterhead, new_waterhead, iteration_data
+        ))
+        for (i, s), (j, y), (k, m), (l, h) in product(
+            enumerate(self.stations), enumerate(self.year),
+            enumerate(self.month), enumerate(self.hour)
+        ):
+            # The forebay level of hour h is the mean of the storage at
+            # hours h - 1 and h of hour_p.
+            fore = (encode(s, h - 1, m, y) + encode(s, h, m, y)) / 2
+            self.assertAlmostEqual(
+                new_waterhead[i, j, k, l],
+                fore - scale[s] * encode(s, h, m, y)
+            )
+            coefficient = self.model.coefficients[
+                ('cons', s, h, m, y), ('genflow', s, h, m, y)
+            ]
+            self.assertAlmostEqual(
+                coefficient,
+                - params['reservoir_characteristics']['coeff', s] * 1e-3
+                * old_waterhead[i, j, k, l]
+            )
+
+    def test_compute_error(self):
+        """Test the compute_error function.
+        """
+        old_waterhead = np.array([[2., 2.], [4., 1.]])
+        new_waterhead = np.array([[4., 3.], [2., -1.]])
+        buffer = np.empty_like(old_waterhead)
+        self.assertAlmostEqual(
+            compute_error(old_waterhead, new_waterhead, buffer),
+            (2 / 4 + 1 / 3 + 2 / 2 + 0 / 1) / 4
+        )
+        # Non-positive new water heads are replaced by 1.
+        self.assertEqual(new_waterhead[1, 1], 1)
+        self.assertAlmostEqual(
+            compute_error(old_waterhead, new_waterhead), 11 / 24
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,219 @@
+"""This module contains tests for the load_data module.
+"""
+
+import os
+import hmac
+import pickle
+import hashlib
+import unittest
+import tempfile
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from prepshot.load_data import read_excel
+from prepshot.load_data import read_excel_cached
+
+# Calls of planted_payload, which must never run.
+PLANTED_CALLS = []
+
+def planted_payload():
+    """Record a call from a planted cache file.
+    """
+    PLANTED_CALLS.append(True)
+    return 'planted'
+
+class PlantedPickle:
+    """Object whose unpickling calls planted_payload.
+    """
+
+    def __reduce__(self):
+        return planted_payload, ()
+
+class TestLoadData(unittest.TestCase):
+    """Tests for the load_data module.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, 'data.xlsx')
+        self.cache_folder = os.path.join(self.tmpdir.name, 'cache')
+        self.cache_file = os.path.join(
+            self.cache_folder,
+            hashlib.sha256(self.filename.encode('utf-8')).hexdigest() + '.pkl'
+        )
+        del PLANTED_CALLS[:]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_excel(self, values, mtime=None):
+        """Write a sheet with a key column and a value column.
+        """
+        pd.DataFrame({'key': ['x', 'y'], 'value': values}).to_excel(
+            self.filename, index=False
+        )
+        if mtime is not None:
+            os.utime(self.filename, ns=(mtime, mtime))
+
+    def read(self):
+        """Read the sheet as a dictionary of values.
+        """
+        df = read_excel_cached(self.filename, [0], [0], self.cache_folder)
+        return df['value'].to_dict()
+
+    def write_cache(self, content):
+        """Overwrite the cache file of the sheet.
+        """
+        with open(self.cache_file, 'wb') as f:
+            f.write(content)
+
+    def sign(self, payload):
+        """Sign a payload with the key of the cache folder.
+        """
+        with open(os.path.join(self.cache_folder, 'cache.key'), 'rb') as f:
+            secret = f.read()
+        return hmac.new(secret, payload, hashlib.sha256).digest()
+
+    def test_read_excel_cached(self):
+        """Test the prepshot.load_data.read_excel_cached function.
+        """
+        self.write_excel([1, 2])
+        self.assertDictEqual(self.read(), {'x': 1, 'y': 2})
+        self.assertTrue(os.path.exists(self.cache_file))
+        self.assertEqual(
+            os.stat(os.path.join(self.cache_folder, 'cache.key')).st_mode
+            & 0o777, 0o600
+        )
+        # The cache is used as long as the Excel file is unchanged.
+        with mock.patch(
+            'prepshot.load_data.pd.read_excel', side_effect=AssertionError
+        ):
+            self.assertDictEqual(self.read(), {'x': 1, 'y': 2})
+        # Other read arguments do not reuse the cache.
+        self.assertListEqual(
+            read_excel_cached(
+                self.filename, [0, 1], [0], self.cache_folder
+            ).index.tolist(),
+            [('x', 1), ('y', 2)]
+        )
+
+    def test_read_excel_cached_invalidation(self):
+        """Test that an Excel file replaced by an older one is read again.
+        """
+        self.write_excel([1, 2])
+        self.assertDictEqual(self.read(), {'x': 1, 'y': 2})
+        old_mtime = os.stat(self.filename).st_mtime_ns - 10 ** 10
+        self.write_excel([10, 20], mtime=old_mtime)
+        self.assertDictEqual(self.read(), {'x': 10, 'y': 20})
+
+    def test_read_excel_cached_corrupt(self):
+        """Test that an unreadable cache is rebuilt.
+        """
+        self.write_excel([1, 2])
+        self.read()
+        # The last one refers to a missing attribute, as pickles written by
+        # another pandas version may do.
+        for content in (
+            b'', b'not a pickle',
+            self.sign(b'not a pickle') + b'not a pickle',
+            self.sign(b'cbuiltins\nno_such_attr\n.')
+            + b'cbuiltins\nno_such_attr\n.'
+        ):
+            self.write_cache(content)
+            with self.assertLogs(level='WARNING'):
+                self.assertDictEqual(self.read(), {'x': 1, 'y': 2})
+        with mock.patch(
+            'prepshot.load_data.pd.read_excel', side_effect=AssertionError
+        ):
+            self.assertDictEqual(self.read(), {'x': 1, 'y': 2})
+
+    def test_read_excel_cached_planted(self):
+        """Test that a cache file not written by prepshot is never
+        unpickled.
+        """
+        self.write_excel([1, 2])
+        self.read()
+        payload = pickle.dumps((('other key',), PlantedPickle()))
+        forged = hmac.new(b'\0' * 32, payload, hashlib.sha256).digest()
+        for content in (payload, forged + payload):
+            self.write_cache(content)
+            with self.assertLogs(level='WARNING'):
+                self.assertDictEqual(self.read(), {'x': 1, 'y': 2})
+            self.assertListEqual(PLANTED_CALLS, [])
+
+    def test_read_excel_without_cache(self):
+        """Test that prepshot.load_data.read_excel does not cache by
+        default.
+        """
+        self.write_excel([1, 2])
+        df = read_excel(self.filename, [0], [0], dropna=False)
+        self.assertDictEqual(df['value'].to_dict(), {'x': 1, 'y': 2})
+        self.assertFalse(os.path.exists(self.cache_folder))
+        df = read_excel(
+            self.filename, [0], [0], dropna=False,
+            cache_folder=self.cache_folder
+        )
+        self.assertDictEqual(df['value'].to_dict(), {'x': 1, 'y': 2})
+        self.assertTrue(os.path.exists(self.cache_file))
+
+    def assert_read_excel_unstacks(self, df, index_cols, header_rows):
+        """Check read_excel against unstacking and dropping NaN values for
+        every order of the index levels, including value types.
+        """
+        df.to_excel(self.filename)
+        sheet = pd.read_excel(
+            self.filename, index_col=index_cols, header=header_rows
+        )
+        levels = list(range(len(index_cols)))
+        for unstack_levels in (levels, levels[::-1]):
+            expected = sheet.unstack(level=unstack_levels).dropna().to_dict()
+            result = read_excel(
+                self.filename, index_cols, header_rows, unstack_levels
+            )
+            self.assertDictEqual(result, expected)
+            self.assertDictEqual(
+                {key: type(value) for key, value in result.items()},
+                {key: type(value) for key, value in expected.items()}
+            )
+
+    def test_read_excel(self):
+        """Test the prepshot.load_data.read_excel function.
+        """
+        # Integer values only.
+        self.assert_read_excel_unstacks(
+            pd.DataFrame(
+                {'x': [1, 2], 'y': [3, 4]},
+                index=pd.Index(['a', 'b'], name='zone')
+            ),
+            [0], [0]
+        )
+        # Mixed integer and float values with NaN, two index levels.
+        self.assert_read_excel_unstacks(
+            pd.DataFrame(
+                {'x': [1, 2, 3, 4], 'y': [0.5, np.nan, 1.5, 2.5]},
+                index=pd.MultiIndex.from_product(
+                    [['a', 'b'], [1, 2]], names=['zone', 'month']
+                )
+            ),
+            [0, 1], [0]
+        )
+        # Two header rows and three index levels.
+        self.assert_read_excel_unstacks(
+            pd.DataFrame(
+                [[1, 2.5, np.nan], [4, np.nan, 6.5]] * 4,
+                index=pd.MultiIndex.from_product(
+                    [['a', 'b'], [1, 2], [1, 2]],
+                    names=['zone', 'month', 'hour']
+                ),
+                columns=pd.MultiIndex.from_tuples(
+                    [('Solar', 2020), ('Solar', 2025), ('Wind', 2020)]
+                )
+            ),
+            [0, 1, 2], [0, 1]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,9 +8,15 @@ import pandas as pd
 
 from prepshot.utils import calc_cost_factor
 from prepshot.utils import calc_inv_cost_factor
+from prepshot.utils import calc_capital_recovery_factor
 from prepshot.utils import check_positive
+from prepshot.utils import DiscountTable
 from prepshot.utils import interpolate_z_by_q_or_s
+from prepshot.utils import build_interpolators
+from prepshot.utils import build_zqv_registry
+from prepshot.utils import interpolate_z_batch
 from prepshot.utils import cartesian_product
+from prepshot.utils import cartesian_product_iter
 
 class TestUtils(unittest.TestCase):
     """Tests for the utils module.
@@ -23,6 +29,10 @@ class TestUtils(unittest.TestCase):
             calc_cost_factor(0.05, 2025, 2020, 2030),
             3.561871, places=6
         )
+        self.assertAlmostEqual(
+            calc_cost_factor(0.05, 2025, 2020, 2026),
+            1 / 1.05 ** 5
+        )
         with self.assertRaises(ValueError):
             calc_cost_factor(0.05, 2025, 2020, 2024)
         with self.assertRaises(ValueError):
@@ -42,6 +52,58 @@ class TestUtils(unittest.TestCase):
             0.567482, places=6
         )
 
+    def test_calc_capital_recovery_factor(self):
+        """Test the prepshot.utils.calc_capital_recovery_factor function.
+        """
+        self.assertAlmostEqual(
+            calc_capital_recovery_factor(0.05, 20), 0.080243, places=6
+        )
+        self.assertAlmostEqual(
+            calc_capital_recovery_factor(0.05, 100), 0.050383, places=6
+        )
+
+    def test_discount_table(self):
+        """Test the prepshot.utils.DiscountTable class.
+        """
+        years = [2020, 2025, 2030]
+        table = DiscountTable(years, 0.05, 0.05, 100)
+        np.testing.assert_allclose(
+            table.inv_cost_factor([20, 100, 20]),
+            [
+                calc_inv_cost_factor(20, 0.05, 2020, 0.05, 2020, 2030),
+                calc_inv_cost_factor(100, 0.05, 2025, 0.05, 2020, 2030),
+                calc_inv_cost_factor(20, 0.05, 2030, 0.05, 2020, 2030)
+            ]
+        )
+        np.testing.assert_allclose(
+            table.cost_factor([2025, 2030, 2031]),
+            [
+                calc_cost_factor(0.05, 2020, 2020, 2025),
+                calc_cost_factor(0.05, 2025, 2020, 2030),
+                calc_cost_factor(0.05, 2030, 2020, 2031)
+            ]
+        )
+        np.testing.assert_allclose(
+            table.inv_cost_factor([[20, 100, 20], [100, 100, 100]])[1],
+            table.inv_cost_factor(100)
+        )
+        # Fractional periods and periods beyond the table are computed
+        # directly.
+        np.testing.assert_allclose(
+            table.inv_cost_factor([2.5, 101, 7.5]),
+            [
+                calc_inv_cost_factor(2.5, 0.05, 2020, 0.05, 2020, 2030),
+                calc_inv_cost_factor(101, 0.05, 2025, 0.05, 2020, 2030),
+                calc_inv_cost_factor(7.5, 0.05, 2030, 0.05, 2020, 2030)
+            ]
+        )
+        with self.assertRaises(ValueError):
+            table.inv_cost_factor([20, 0, 20])
+        with self.assertRaises(ValueError):
+            table.cost_factor([2025, 2025, 2031])
+        with self.assertRaises(ValueError):
+            DiscountTable(years, -0.05, 0.05, 100)
+
     def test_check_positive(self):
         """Test the prepshot.utils.check_positive function. 
         """
@@ -49,6 +111,10 @@ class TestUtils(unittest.TestCase):
             check_positive(-0.01)
         with self.assertRaises(ValueError):
             check_positive(0)
+        with self.assertRaises(ValueError):
+            check_positive(1, 2020, -1)
+        check_positive(0.01, 2020)
+        check_positive()
 
     def test_interpolate_z_by_q_or_s(self):
         """Test the prepshot.utils.interpolate_z_by_q_or_s function.
@@ -101,6 +167,59 @@ class TestUtils(unittest.TestCase):
             np.array([-25, 100, 300])
         )
  
+    def test_build_zqv_registry(self):
+        """Test the prepshot.utils.build_zqv_registry function.
+        """
+        zv = pd.DataFrame({
+            'name' : [1, 1, 1, 2, 2],
+            'V' : [300, 0, 200, 100, 0],
+            'Z' : [200, 0, 100, 20, 10]
+        })
+        registry = build_zqv_registry(zv)
+        self.assertSetEqual(set(registry), {'1', '2'})
+        x, z = registry['1']
+        np.testing.assert_array_equal(x, np.array([0., 200., 300.]))
+        np.testing.assert_array_equal(z, np.array([0., 100., 200.]))
+        self.assertTrue(x.flags['C_CONTIGUOUS'])
+        self.assertEqual(x.dtype, np.float64)
+
+    def test_build_interpolators(self):
+        """Test the prepshot.utils.build_interpolators function.
+        """
+        zq = pd.DataFrame({
+            'name' : [1, 1, 1, 2, 2],
+            'Q' : [0, 200, 300, 0, 100],
+            'Z' : [0, 100, 200, 10, 20]
+        })
+        interpolators = build_interpolators(zq)
+        self.assertSetEqual(set(interpolators), {'1', '2'})
+        np.testing.assert_allclose(
+            interpolate_z_by_q_or_s(1, [100, 400], interpolators),
+            np.array([50, 300])
+        )
+        np.testing.assert_allclose(
+            interpolate_z_by_q_or_s('2', [50, 200], interpolators),
+            np.array([15, 30])
+        )
+
+    def test_interpolate_z_batch(self):
+        """Test the prepshot.utils.interpolate_z_batch function.
+        """
+        zq = pd.DataFrame({
+            'name' : [1, 1, 1, 2, 2],
+            'Q' : [0, 200, 300, 0, 100],
+            'Z' : [0, 100, 200, 10, 20]
+        })
+        qs = np.array([[[100, 400]], [[50, 200]]])
+        expected = np.array([[[50, 300]], [[15, 30]]])
+        np.testing.assert_allclose(
+            interpolate_z_batch([1, 2], qs, zq), expected
+        )
+        np.testing.assert_allclose(
+            interpolate_z_batch(['1', '2'], qs, build_interpolators(zq)),
+            expected
+        )
+
     def test_cartestian(self):
         """Test the prepshot.utils.cartestian function.
         """
@@ -117,5 +236,13 @@ class TestUtils(unittest.TestCase):
             [(1,), (2,)]
         )
 
+    def test_cartesian_product_iter(self):
+        """Test the prepshot.utils.cartesian_product_iter function.
+        """
+        self.assertListEqual(
+            list(cartesian_product_iter([1, 2], [3, 4])),
+            cartesian_product([1, 2], [3, 4])
+        )
+
 if __name__ == '__main__':
     unittest.main()